@@ -3,12 +3,20 @@ Device Management API Controller.
 Handles all HTTP endpoints for device management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, RedirectResponse
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+import operator
+import threading
 from typing import Optional, List
 
-from helpers.config import session_factory, logger
-from dal.device_dao import DeviceDAO
+from helpers.config import session_factory, async_session_factory, logger
+from helpers.pagination import encode_cursor, decode_cursor
+from dal.device_dao import ALLOWED_FROM, DeviceDAO
 from entities.device import Device, DeviceStatus, DeviceType
 from dto.device_dto import (
     DeviceRequest,
@@ -22,167 +30,159 @@ from dto.device_dto import (
     ActionResponse,
     DeviceStatusDto,
     DeviceTypeDto,
+    DeviceField,
     ReserveRequest,
     TelemetryRequest,
     DeviceEventRequest
 )
 from services.jwt_service import get_current_user, AuthUser
-from services.rabbitmq_publisher import RabbitMQPublisher
+from services.rabbitmq_publisher import rabbitmq_publisher
+from services.async_rabbitmq_publisher import async_rabbitmq_publisher
 
 router = APIRouter(prefix="/devices", tags=["devices"])
-rabbitmq_publisher = RabbitMQPublisher()
+
+# (name, status) of recently seen devices for the telemetry hot path.
+# Entries are dropped on every mutation; the TTL bounds staleness across instances.
+_DEVICE_CACHE: TTLCache = TTLCache(maxsize=50_000, ttl=60)
+_DEVICE_CACHE_LOCK = threading.Lock()
 
 
 def get_db_session():
-    """Dependency to get database session."""
-    return next(session_factory())
+    """Dependency to get database session, closed once the request is done."""
+    yield from session_factory()
+
+
+async def get_async_db_session():
+    """Dependency to get an async database session for async endpoints."""
+    async for session in async_session_factory():
+        yield session
+
+
+async def _get_device_cached(session: AsyncSession, device_id: int) -> Optional[tuple[str, DeviceStatus]]:
+    """Get (name, status) of a device, hitting the database only on cache miss."""
+    with _DEVICE_CACHE_LOCK:
+        cached = _DEVICE_CACHE.get(device_id)
+    if cached is not None:
+        return cached
+    
+    device = await DeviceDAO.get_device_by_id_async(session, device_id)
+    if not device:
+        return None
+    
+    cached = (device.name, device.status)
+    with _DEVICE_CACHE_LOCK:
+        _DEVICE_CACHE[device_id] = cached
+    return cached
+
+
+def _invalidate_cached_device(device_id: int):
+    """Drop a device from the telemetry cache after it changed."""
+    with _DEVICE_CACHE_LOCK:
+        _DEVICE_CACHE.pop(device_id, None)
+
+
+# Fetches every rendered attribute of a Device in a single C-level call
+_DEVICE_FIELDS = operator.attrgetter(
+    'id', 'name', 'type', 'serial_number', 'description', 'status', 'location',
+    'specifications', 'purchase_date', 'deploy_date', 'last_maintenance_date',
+    'created_at', 'updated_at'
+)
 
 
-@router.get("/", response_model=DeviceListResponse)
+def _to_response(d: Device) -> DeviceResponse:
+    """Convert a Device entity to its response representation."""
+    (id_, name, type_, serial_number, description, status, location, specifications,
+     purchase_date, deploy_date, last_maintenance_date, created_at, updated_at) = _DEVICE_FIELDS(d)
+    return DeviceResponse(
+        id=id_,
+        name=name,
+        type=type_,
+        serial_number=serial_number,
+        description=description,
+        status=status,
+        location=location,
+        specifications=specifications,
+        purchase_date=purchase_date,
+        deploy_date=deploy_date,
+        last_maintenance_date=last_maintenance_date,
+        created_at=created_at,
+        updated_at=updated_at
+    )
+
+
+def _project(row: Row, fields: List[DeviceField]) -> dict:
+    """Render the requested fields of a projected device row."""
+    return {field.value: getattr(row, field.value) for field in fields}
+
+
+@router.get("/", response_model=DeviceListResponse, response_class=ORJSONResponse)
 def get_all_devices(
     status: Optional[DeviceStatusDto] = Query(None, description="Filter by status"),
     device_type: Optional[DeviceTypeDto] = Query(None, description="Filter by type"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (deprecated, use cursor)", deprecated=True),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    fields: Optional[List[DeviceField]] = Query(None, description="Only return these fields (all by default)"),
+    include_total: bool = Query(False, description="Include the total number of matching devices"),
     session: Session = Depends(get_db_session),
     current_user: AuthUser = Depends(get_current_user)
 ):
     """
     Get all devices with optional filtering and pagination.
     
-    Returns a paginated list of devices.
+    Returns a paginated list of devices. Pass the returned `next_cursor`
+    to fetch the following page; `page` is kept for backward compatibility.
+    Use `fields` to fetch and return only a subset of the device columns.
+    `total` is only computed when `include_total` is set, as it costs an
+    extra COUNT query.
     """
-    logger.info(f"User {current_user.email} getting devices - status: {status}, type: {device_type}, page: {page}")
+    logger.info(f"User {current_user.email} getting devices - status: {status}, type: {device_type}, page: {page}, cursor: {cursor}")
     
-    devices, total = DeviceDAO.get_all_devices(
+    cursor_id = None
+    if cursor:
+        try:
+            cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
+    devices, total, next_id = DeviceDAO.get_all_devices(
         session=session,
         status=status,
         device_type=device_type,
+        cursor_id=cursor_id,
+        page_size=page_size,
         page=page,
-        page_size=page_size
+        fields=[f.value for f in fields] if fields else None,
+        include_total=include_total
     )
     
-    device_responses = [
-        DeviceResponse(
-            id=d.id,
-            name=d.name,
-            type=d.type.value if d.type else None,
-            serial_number=d.serial_number,
-            description=d.description,
-            status=d.status.value if d.status else None,
-            location=d.location,
-            specifications=d.specifications,
-            purchase_date=str(d.purchase_date) if d.purchase_date else None,
-            deploy_date=str(d.deploy_date) if d.deploy_date else None,
-            last_maintenance_date=str(d.last_maintenance_date) if d.last_maintenance_date else None,
-            created_at=str(d.created_at) if d.created_at else None,
-            updated_at=str(d.updated_at) if d.updated_at else None
-        )
-        for d in devices
-    ]
-    
-    return DeviceListResponse(
-        devices=device_responses,
+    page_info = dict(
         total=total,
-        page=page,
-        page_size=page_size
+        page=None if cursor_id is not None else page,
+        page_size=page_size,
+        next_cursor=encode_cursor(next_id) if next_id is not None else None,
+        has_more=next_id is not None
     )
+    if fields:
+        items = [_project(d, fields) for d in devices]
+        return ORJSONResponse(content={'devices': items, **page_info})
+    
+    # Data is already validated, so skip FastAPI's response_model round-trip
+    # and let pydantic's serializer write the JSON bytes directly
+    response = DeviceListResponse.model_construct(devices=[_to_response(d) for d in devices], **page_info)
+    return Response(content=response.model_dump_json(), media_type='application/json')
 
 
-@router.get("/in_stock", response_model=List[DeviceResponse])
-def get_in_stock_devices(
-    session: Session = Depends(get_db_session),
-    current_user: AuthUser = Depends(get_current_user)
-):
-    """
-    Get all devices that are in stock (available).
-    """
-    logger.info(f"User {current_user.email} getting in-stock devices")
-    
-    devices = DeviceDAO.get_devices_by_status(session, DeviceStatusDto.IN_STOCK)
-    
-    return [
-        DeviceResponse(
-            id=d.id,
-            name=d.name,
-            type=d.type.value if d.type else None,
-            serial_number=d.serial_number,
-            description=d.description,
-            status=d.status.value if d.status else None,
-            location=d.location,
-            specifications=d.specifications,
-            purchase_date=str(d.purchase_date) if d.purchase_date else None,
-            deploy_date=str(d.deploy_date) if d.deploy_date else None,
-            last_maintenance_date=str(d.last_maintenance_date) if d.last_maintenance_date else None,
-            created_at=str(d.created_at) if d.created_at else None,
-            updated_at=str(d.updated_at) if d.updated_at else None
-        )
-        for d in devices
-    ]
-
-
-@router.get("/deployed", response_model=List[DeviceResponse])
-def get_deployed_devices(
-    session: Session = Depends(get_db_session),
-    current_user: AuthUser = Depends(get_current_user)
-):
-    """
-    Get all devices that are deployed in the field.
-    """
-    logger.info(f"User {current_user.email} getting deployed devices")
-    
-    devices = DeviceDAO.get_devices_by_status(session, DeviceStatusDto.DEPLOYED)
-    
-    return [
-        DeviceResponse(
-            id=d.id,
-            name=d.name,
-            type=d.type.value if d.type else None,
-            serial_number=d.serial_number,
-            description=d.description,
-            status=d.status.value if d.status else None,
-            location=d.location,
-            specifications=d.specifications,
-            purchase_date=str(d.purchase_date) if d.purchase_date else None,
-            deploy_date=str(d.deploy_date) if d.deploy_date else None,
-            last_maintenance_date=str(d.last_maintenance_date) if d.last_maintenance_date else None,
-            created_at=str(d.created_at) if d.created_at else None,
-            updated_at=str(d.updated_at) if d.updated_at else None
-        )
-        for d in devices
-    ]
-
-
-@router.get("/maintenance", response_model=List[DeviceResponse])
-def get_maintenance_devices(
-    session: Session = Depends(get_db_session),
-    current_user: AuthUser = Depends(get_current_user)
-):
+@router.get("/in_stock", status_code=301, include_in_schema=False)
+@router.get("/deployed", status_code=301, include_in_schema=False)
+@router.get("/maintenance", status_code=301, include_in_schema=False)
+def redirect_status_listing(request: Request):
     """
-    Get all devices that are in maintenance.
+    Redirect the legacy per-status listings to the paginated /?status= listing.
     """
-    logger.info(f"User {current_user.email} getting maintenance devices")
-    
-    devices = DeviceDAO.get_devices_by_status(session, DeviceStatusDto.MAINTENANCE)
-    
-    return [
-        DeviceResponse(
-            id=d.id,
-            name=d.name,
-            type=d.type.value if d.type else None,
-            serial_number=d.serial_number,
-            description=d.description,
-            status=d.status.value if d.status else None,
-            location=d.location,
-            specifications=d.specifications,
-            purchase_date=str(d.purchase_date) if d.purchase_date else None,
-            deploy_date=str(d.deploy_date) if d.deploy_date else None,
-            last_maintenance_date=str(d.last_maintenance_date) if d.last_maintenance_date else None,
-            created_at=str(d.created_at) if d.created_at else None,
-            updated_at=str(d.updated_at) if d.updated_at else None
-        )
-        for d in devices
-    ]
+    status = DeviceStatusDto(request.url.path.rsplit('/', 1)[-1])
+    url = request.url_for('get_all_devices').include_query_params(status=status.value)
+    return RedirectResponse(url=str(url), status_code=301)
 
 
 @router.get("/{device_id}", response_model=DeviceResponse)
@@ -200,21 +200,7 @@ def get_device_by_id(
     if not device:
         raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
     
-    return DeviceResponse(
-        id=device.id,
-        name=device.name,
-        type=device.type.value if device.type else None,
-        serial_number=device.serial_number,
-        description=device.description,
-        status=device.status.value if device.status else None,
-        location=device.location,
-        specifications=device.specifications,
-        purchase_date=str(device.purchase_date) if device.purchase_date else None,
-        deploy_date=str(device.deploy_date) if device.deploy_date else None,
-        last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-        created_at=str(device.created_at) if device.created_at else None,
-        updated_at=str(device.updated_at) if device.updated_at else None
-    )
+    return _to_response(device)
 
 
 @router.post("/", response_model=DeviceResponse, status_code=201)
@@ -239,27 +225,13 @@ def create_device(
     )
     
     # Create in database
-    success = DeviceDAO.create_device(session, device)
-    if not success:
+    device = DeviceDAO.create_device(session, device)
+    if not device:
         raise HTTPException(status_code=400, detail="Device with this serial number already exists")
     
     logger.info(f"Device created successfully with ID: {device.id}")
     
-    return DeviceResponse(
-        id=device.id,
-        name=device.name,
-        type=device.type.value if device.type else None,
-        serial_number=device.serial_number,
-        description=device.description,
-        status=device.status.value if device.status else None,
-        location=device.location,
-        specifications=device.specifications,
-        purchase_date=str(device.purchase_date) if device.purchase_date else None,
-        deploy_date=str(device.deploy_date) if device.deploy_date else None,
-        last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-        created_at=str(device.created_at) if device.created_at else None,
-        updated_at=str(device.updated_at) if device.updated_at else None
-    )
+    return _to_response(device)
 
 
 @router.put("/{device_id}", response_model=DeviceResponse)
@@ -286,23 +258,10 @@ def update_device(
     if not device:
         raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
     
+    _invalidate_cached_device(device_id)
     logger.info(f"Device {device_id} updated successfully")
     
-    return DeviceResponse(
-        id=device.id,
-        name=device.name,
-        type=device.type.value if device.type else None,
-        serial_number=device.serial_number,
-        description=device.description,
-        status=device.status.value if device.status else None,
-        location=device.location,
-        specifications=device.specifications,
-        purchase_date=str(device.purchase_date) if device.purchase_date else None,
-        deploy_date=str(device.deploy_date) if device.deploy_date else None,
-        last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-        created_at=str(device.created_at) if device.created_at else None,
-        updated_at=str(device.updated_at) if device.updated_at else None
-    )
+    return _to_response(device)
 
 
 @router.delete("/{device_id}", response_model=ActionResponse)
@@ -320,6 +279,7 @@ def delete_device(
     if not success:
         raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
     
+    _invalidate_cached_device(device_id)
     logger.info(f"Device {device_id} retired successfully")
     
     return ActionResponse(
@@ -331,6 +291,21 @@ def delete_device(
 # ===================== STATUS MANAGEMENT ENDPOINTS =====================
 
 
+def _allowed_statuses(action: str) -> str:
+    """Human-readable list of the statuses a transition is allowed from."""
+    names = [f"'{status.value}'" for status in ALLOWED_FROM[action]]
+    if len(names) < 3:
+        return ' or '.join(names)
+    return ', '.join(names[:-1]) + ', or ' + names[-1]
+
+
+def _transition_failed(session: Session, device_id: int, detail: str) -> HTTPException:
+    """Error for a rejected status transition: 404 if the device is missing, 400 otherwise."""
+    if not DeviceDAO.get_device_by_id(session, device_id):
+        return HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
+    return HTTPException(status_code=400, detail=detail)
+
+
 @router.put("/{device_id}/status", response_model=DeviceResponse)
 def update_device_status(
     device_id: int,
@@ -343,49 +318,27 @@ def update_device_status(
     """
     logger.info(f"User {current_user.email} updating device {device_id} status to: {status_request.status}")
     
-    old_device = DeviceDAO.get_device_by_id(session, device_id)
-    if not old_device:
-        raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
-    
-    old_status = old_device.status.value if old_device.status else None
-    
-    device = DeviceDAO.update_device_status(
-        session=session,
-        device_id=device_id,
-        new_status=status_request.status,
-        location=status_request.location
-    )
-    
-    if not device:
-        raise HTTPException(status_code=400, detail="Failed to update device status")
+    try:
+        result = DeviceDAO.change_status_and_log(
+            session=session,
+            device_id=device_id,
+            new_status=status_request.status,
+            action="status_change",
+            notes=status_request.notes,
+            location=status_request.location
+        )
+    except (IntegrityError, OperationalError) as e:
+        logger.error(f"Failed to save status change of device {device_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to save device status change")
     
-    # Log the action
-    DeviceDAO.log_action(
-        session=session,
-        device_id=device_id,
-        action="status_change",
-        old_status=old_status,
-        new_status=status_request.status.value,
-        notes=status_request.notes
-    )
+    if not result:
+        raise _transition_failed(session, device_id, "Failed to update device status")
+    device, _ = result
     
+    _invalidate_cached_device(device_id)
     logger.info(f"Device {device_id} status updated to {status_request.status}")
     
-    return DeviceResponse(
-        id=device.id,
-        name=device.name,
-        type=device.type.value if device.type else None,
-        serial_number=device.serial_number,
-        description=device.description,
-        status=device.status.value if device.status else None,
-        location=device.location,
-        specifications=device.specifications,
-        purchase_date=str(device.purchase_date) if device.purchase_date else None,
-        deploy_date=str(device.deploy_date) if device.deploy_date else None,
-        last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-        created_at=str(device.created_at) if device.created_at else None,
-        updated_at=str(device.updated_at) if device.updated_at else None
-    )
+    return _to_response(device)
 
 
 @router.put("/{device_id}/deploy", response_model=ActionResponse)
@@ -400,26 +353,19 @@ def deploy_device(
     """
     logger.info(f"User {current_user.email} deploying device {device_id} to: {deploy_request.location}")
     
-    old_device = DeviceDAO.get_device_by_id(session, device_id)
-    if not old_device:
-        raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
-    
-    old_status = old_device.status.value if old_device.status else None
-    
-    device = DeviceDAO.deploy_device(
+    result = DeviceDAO.deploy_device(
         session=session,
         device_id=device_id,
-        deployment_location=deploy_request.location
+        deployment_location=deploy_request.location,
+        commit=False
     )
     
-    if not device:
-        raise HTTPException(
-            status_code=400, 
-            detail="Device cannot be deployed. It must be in 'in_stock', 'reserved', or 'maintenance' status."
-        )
+    if not result:
+        raise _transition_failed(session, device_id, f"Device cannot be deployed. It must be in {_allowed_statuses('deploy')} status.")
+    device, old_status = result
     
-    # Log the action
-    DeviceDAO.log_action(
+    # Log the action; this commits the status change and the log entry together
+    logged = DeviceDAO.log_action(
         session=session,
         device_id=device_id,
         action="deployed",
@@ -427,27 +373,16 @@ def deploy_device(
         new_status="deployed",
         notes=deploy_request.notes
     )
+    if not logged:
+        raise HTTPException(status_code=500, detail="Failed to save device status change")
     
+    _invalidate_cached_device(device_id)
     logger.info(f"Device {device_id} deployed successfully")
     
     return ActionResponse(
         success=True,
         message=f"Device {device_id} deployed to {deploy_request.location}",
-        device=DeviceResponse(
-            id=device.id,
-            name=device.name,
-            type=device.type.value if device.type else None,
-            serial_number=device.serial_number,
-            description=device.description,
-            status=device.status.value if device.status else None,
-            location=device.location,
-            specifications=device.specifications,
-            purchase_date=str(device.purchase_date) if device.purchase_date else None,
-            deploy_date=str(device.deploy_date) if device.deploy_date else None,
-            last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-            created_at=str(device.created_at) if device.created_at else None,
-            updated_at=str(device.updated_at) if device.updated_at else None
-        )
+        device=_to_response(device)
     )
 
 
@@ -463,26 +398,19 @@ def recall_device(
     """
     logger.info(f"User {current_user.email} recalling device {device_id}")
     
-    old_device = DeviceDAO.get_device_by_id(session, device_id)
-    if not old_device:
-        raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
-    
-    old_status = old_device.status.value if old_device.status else None
-    
-    device = DeviceDAO.recall_device(
+    result = DeviceDAO.recall_device(
         session=session,
         device_id=device_id,
-        warehouse_location=recall_request.location
+        warehouse_location=recall_request.location,
+        commit=False
     )
     
-    if not device:
-        raise HTTPException(
-            status_code=400, 
-            detail="Device cannot be recalled. It must be in 'deployed' status."
-        )
+    if not result:
+        raise _transition_failed(session, device_id, f"Device cannot be recalled. It must be in {_allowed_statuses('recall')} status.")
+    device, old_status = result
     
-    # Log the action
-    DeviceDAO.log_action(
+    # Log the action; this commits the status change and the log entry together
+    logged = DeviceDAO.log_action(
         session=session,
         device_id=device_id,
         action="recalled",
@@ -490,27 +418,16 @@ def recall_device(
         new_status="in_stock",
         notes=recall_request.notes
     )
+    if not logged:
+        raise HTTPException(status_code=500, detail="Failed to save device status change")
     
+    _invalidate_cached_device(device_id)
     logger.info(f"Device {device_id} recalled successfully")
     
     return ActionResponse(
         success=True,
         message=f"Device {device_id} recalled to stock",
-        device=DeviceResponse(
-            id=device.id,
-            name=device.name,
-            type=device.type.value if device.type else None,
-            serial_number=device.serial_number,
-            description=device.description,
-            status=device.status.value if device.status else None,
-            location=device.location,
-            specifications=device.specifications,
-            purchase_date=str(device.purchase_date) if device.purchase_date else None,
-            deploy_date=str(device.deploy_date) if device.deploy_date else None,
-            last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-            created_at=str(device.created_at) if device.created_at else None,
-            updated_at=str(device.updated_at) if device.updated_at else None
-        )
+        device=_to_response(device)
     )
 
 
@@ -526,22 +443,14 @@ def send_to_maintenance(
     """
     logger.info(f"User {current_user.email} sending device {device_id} to maintenance")
     
-    old_device = DeviceDAO.get_device_by_id(session, device_id)
-    if not old_device:
-        raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
-    
-    old_status = old_device.status.value if old_device.status else None
-    
-    device = DeviceDAO.send_to_maintenance(session, device_id)
+    result = DeviceDAO.send_to_maintenance(session, device_id, commit=False)
     
-    if not device:
-        raise HTTPException(
-            status_code=400, 
-            detail="Device cannot be sent to maintenance."
-        )
+    if not result:
+        raise _transition_failed(session, device_id, "Device cannot be sent to maintenance.")
+    device, old_status = result
     
-    # Log the action
-    DeviceDAO.log_action(
+    # Log the action; this commits the status change and the log entry together
+    logged = DeviceDAO.log_action(
         session=session,
         device_id=device_id,
         action="maintenance",
@@ -549,27 +458,16 @@ def send_to_maintenance(
         new_status="maintenance",
         notes=maintenance_request.notes
     )
+    if not logged:
+        raise HTTPException(status_code=500, detail="Failed to save device status change")
     
+    _invalidate_cached_device(device_id)
     logger.info(f"Device {device_id} sent to maintenance")
     
     return ActionResponse(
         success=True,
         message=f"Device {device_id} sent to maintenance",
-        device=DeviceResponse(
-            id=device.id,
-            name=device.name,
-            type=device.type.value if device.type else None,
-            serial_number=device.serial_number,
-            description=device.description,
-            status=device.status.value if device.status else None,
-            location=device.location,
-            specifications=device.specifications,
-            purchase_date=str(device.purchase_date) if device.purchase_date else None,
-            deploy_date=str(device.deploy_date) if device.deploy_date else None,
-            last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-            created_at=str(device.created_at) if device.created_at else None,
-            updated_at=str(device.updated_at) if device.updated_at else None
-        )
+        device=_to_response(device)
     )
 
 
@@ -585,22 +483,14 @@ def reserve_device(
     """
     logger.info(f"User {current_user.email} reserving device {device_id}")
     
-    old_device = DeviceDAO.get_device_by_id(session, device_id)
-    if not old_device:
-        raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
-    
-    old_status = old_device.status.value if old_device.status else None
-    
-    device = DeviceDAO.reserve_device(session, device_id)
+    result = DeviceDAO.reserve_device(session, device_id, commit=False)
     
-    if not device:
-        raise HTTPException(
-            status_code=400, 
-            detail="Device cannot be reserved. It must be in 'in_stock' status."
-        )
+    if not result:
+        raise _transition_failed(session, device_id, f"Device cannot be reserved. It must be in {_allowed_statuses('reserve')} status.")
+    device, old_status = result
     
-    # Log the action
-    DeviceDAO.log_action(
+    # Log the action; this commits the status change and the log entry together
+    logged = DeviceDAO.log_action(
         session=session,
         device_id=device_id,
         action="reserved",
@@ -608,6 +498,8 @@ def reserve_device(
         new_status="reserved",
         notes=reserve_request.notes
     )
+    if not logged:
+        raise HTTPException(status_code=500, detail="Failed to save device status change")
     
     # Notify Monitoring Service via RabbitMQ
     rabbitmq_publisher.publish_device_event(
@@ -617,74 +509,65 @@ def reserve_device(
         details={"notes": reserve_request.notes}
     )
     
+    _invalidate_cached_device(device_id)
     logger.info(f"Device {device_id} reserved successfully")
     
     return ActionResponse(
         success=True,
         message=f"Device {device_id} reserved",
-        device=DeviceResponse(
-            id=device.id,
-            name=device.name,
-            type=device.type.value if device.type else None,
-            serial_number=device.serial_number,
-            description=device.description,
-            status=device.status.value if device.status else None,
-            location=device.location,
-            specifications=device.specifications,
-            purchase_date=str(device.purchase_date) if device.purchase_date else None,
-            deploy_date=str(device.deploy_date) if device.deploy_date else None,
-            last_maintenance_date=str(device.last_maintenance_date) if device.last_maintenance_date else None,
-            created_at=str(device.created_at) if device.created_at else None,
-            updated_at=str(device.updated_at) if device.updated_at else None
-        )
+        device=_to_response(device)
     )
 
 
 @router.post("/telemetry", response_model=ActionResponse)
-def receive_telemetry(
+async def receive_telemetry(
     request: TelemetryRequest,
-    session: Session = Depends(get_db_session)
+    session: AsyncSession = Depends(get_async_db_session)
 ):
     """
-    Receive telemetry from a device and publish to RabbitMQ.
+    Receive telemetry from a device and queue it for publishing to RabbitMQ.
     Note: Usually telemetry doesn't require JWT for performance, 
     but you can add get_current_user dependecy if needed.
+    Runs on the event loop (async DB session + aio-pika) rather than the threadpool.
     """
     # Verify device exists
-    device = DeviceDAO.get_device_by_id(session, request.device_id)
-    if not device:
+    cached = await _get_device_cached(session, request.device_id)
+    if not cached:
         # For security/privacy, we might just return success even if device doesn't exist,
         # or log an error. Here we raise 404.
         raise HTTPException(status_code=404, detail=f"Device {request.device_id} not found")
+    device_name, device_status = cached
     
     # We only accept telemetry from deployed devices
-    if device.status != DeviceStatus.DEPLOYED:
+    if device_status != DeviceStatus.DEPLOYED:
         raise HTTPException(status_code=400, detail="Device must be 'deployed' to send telemetry")
 
     # Publish to RabbitMQ
     # Convert Pydantic model to dict, excluding base fields for the 'data' part
     telemetry_dict = request.model_dump(exclude={"device_id", "device_name", "timestamp", "location"})
     
-    success = rabbitmq_publisher.publish_telemetry(
-        device_id=device.id,
-        device_name=device.name,
+    # Buffered and published in the background, so the broker round trip
+    # is not on the request path
+    queued = async_rabbitmq_publisher.enqueue_telemetry(
+        device_id=request.device_id,
+        device_name=device_name,
         data=telemetry_dict
     )
     
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to publish telemetry")
+    if not queued:
+        raise HTTPException(status_code=503, detail="Telemetry buffer full, retry later")
         
-    return ActionResponse(success=True, message="Telemetry received and published")
+    return ActionResponse(success=True, message="Telemetry received")
 
 
 @router.post("/events", response_model=ActionResponse)
-def receive_event(
+async def receive_event(
     request: DeviceEventRequest,
 ):
     """
     Receive events/alerts from a device and publish to RabbitMQ.
     """
-    success = rabbitmq_publisher.publish_device_event(
+    success = await async_rabbitmq_publisher.publish_device_event(
         device_id=request.device_id,
         device_name=f"Device-{request.device_id}",
         event_type=request.event_type,
@@ -710,4 +593,4 @@ def get_device_type(
     if not device:
         raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
     
-    return {"device_id": device_id, "type": device.type.value if device.type else "other"}
+    return {"device_id": device_id, "type": device.type or DeviceType.OTHER}
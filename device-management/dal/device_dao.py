@@ -3,88 +3,196 @@ Data Access Layer (DAL) for Device operations.
 Handles all database operations for devices.
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional
+from sqlalchemy import Row, bindparam, func, insert, lambda_stmt, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
+from helpers.config import logger
 from entities.device import Device, DeviceLog, DeviceStatus, DeviceType
 from dto.device_dto import DeviceStatusDto, DeviceTypeDto
 
 
+# Device lifecycle state machine: statuses from which each transition is
+# allowed. Enforced by _transition in the UPDATE's WHERE clause.
+ALLOWED_FROM = {
+    'status_change': tuple(DeviceStatus),
+    'deploy': (DeviceStatus.IN_STOCK, DeviceStatus.RESERVED, DeviceStatus.MAINTENANCE),
+    'recall': (DeviceStatus.DEPLOYED,),
+    'maintenance': tuple(DeviceStatus),
+    'reserve': (DeviceStatus.IN_STOCK,),
+    'retire': tuple(DeviceStatus),
+}
+
+# API enum -> entity enum, built once so filters do a dict lookup instead
+# of constructing the entity enum on every call
+_DTO_TO_ENTITY_STATUS = {dto: DeviceStatus(dto.value) for dto in DeviceStatusDto}
+_DTO_TO_ENTITY_TYPE = {dto: DeviceType(dto.value) for dto in DeviceTypeDto}
+
+# Maximum number of ids bound into one IN (...) clause
+IDS_CHUNK_SIZE = 1000
+
+# Statements built once and executed with parameters, so SQLAlchemy's
+# compiled-statement cache is hit on every call. The fixed-shape lookups are
+# lambda statements, whose cache key is derived from the lambda's code
+# location instead of walking the statement on each execution.
+_SELECT_DEVICES = select(Device).options(raiseload('*'))
+_SELECT_BY_SERIAL = lambda_stmt(
+    lambda: select(Device).options(raiseload('*')).where(Device.serial_number == bindparam('serial_number'))
+)
+_SELECT_BY_STATUS = lambda_stmt(
+    lambda: select(Device).options(raiseload('*')).where(Device.status == bindparam('status'))
+)
+
+
+@contextmanager
+def _write_scope(session: Session, commit: bool) -> Iterator[None]:
+    """
+    Run one DAO write atomically.
+    
+    With commit=True the write is committed, or rolled back on error. With
+    commit=False the caller owns the transaction; if it already holds other
+    work, the write runs in a SAVEPOINT so a failure only undoes the write
+    and the caller's transaction stays usable.
+    """
+    if not commit and session.in_transaction():
+        with session.begin_nested():
+            yield
+        return
+    
+    try:
+        yield
+        if commit:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
 class DeviceDAO:
-    """Data Access Object for Device CRUD operations."""
+    """
+    Data Access Object for Device CRUD operations.
+    
+    Read queries apply raiseload('*'). Device has no relationships today;
+    a relationship added later must be eager-loaded (e.g. selectinload) by
+    the query whose callers need it, otherwise accessing it raises.
+    """
     
     @staticmethod
-    def create_device(session: Session, device: Device) -> bool:
+    def create_device(session: Session, device: Device) -> Optional[Device]:
         """
         Create a new device in the database.
         
+        Uses INSERT ... ON CONFLICT (serial_number) DO NOTHING RETURNING, so
+        the uniqueness check and the insert are one atomic statement.
+        
         Args:
             session: Database session
-            device: Device entity to create
+            device: Device entity holding the values to insert
             
         Returns:
-            True if created successfully, False if serial number already exists
+            The created device, or None if the serial number already exists
         """
-        # Check if serial number already exists
-        existing = session.query(Device).filter(
-            Device.serial_number == device.serial_number
-        ).one_or_none()
-        
-        if existing:
-            return False
-        
-        session.add(device)
+        values = {
+            column.key: getattr(device, column.key)
+            for column in Device.__table__.columns
+            if getattr(device, column.key) is not None
+        }
+        stmt = (
+            pg_insert(Device)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[Device.serial_number])
+            .returning(Device)
+        )
         try:
-            session.commit()
-            session.refresh(device)
-            return True
-        except Exception as e:
-            print(f"Device creation error: {e}")
-            session.rollback()
-            return False
+            with _write_scope(session, commit=True):
+                created = session.execute(stmt).scalar_one_or_none()
+        except (IntegrityError, OperationalError) as e:
+            logger.error(f"Device creation error: {e}")
+            return None
+        return created
     
     @staticmethod
     def get_all_devices(
         session: Session, 
         status: Optional[DeviceStatusDto] = None,
         device_type: Optional[DeviceTypeDto] = None,
-        page: int = 1, 
-        page_size: int = 20
-    ) -> tuple[List[Device], int]:
+        cursor_id: Optional[int] = None,
+        page_size: int = 20,
+        page: int = 1,
+        fields: Optional[List[str]] = None,
+        include_total: bool = False
+    ) -> tuple[List[Device | Row], Optional[int], Optional[int]]:
         """
         Get all devices with optional filtering and pagination.
         
+        Devices are ordered by id. When `cursor_id` is given, keyset
+        pagination (id > cursor_id) is used and `page` is ignored; otherwise
+        the legacy OFFSET-based pagination applies.
+        
         Args:
             session: Database session
             status: Optional status filter
             device_type: Optional type filter
-            page: Page number (1-based)
+            cursor_id: Optional id of the last device of the previous page
             page_size: Number of items per page
+            page: Page number (1-based), used when no cursor is given
+            fields: Optional column names to select; devices are then returned
+                    as Row tuples of those columns (plus id) instead of entities
+            include_total: Also run COUNT(*) over the filtered devices; this
+                           costs a second query that scans every match
             
         Returns:
-            Tuple of (list of devices, total count)
+            Tuple of (list of devices or rows, total count or None if not requested,
+            id to pass as cursor_id for the next page or None if this is the
+            last page)
         """
-        query = session.query(Device)
+        if fields:
+            # Plain column rows skip entity construction and identity-map
+            # bookkeeping; id is always needed for the pagination cursor
+            columns = ['id', *(name for name in fields if name != 'id')]
+            stmt = select(*(getattr(Device, name) for name in columns))
+        else:
+            stmt = _SELECT_DEVICES
         
         # Apply filters
         if status:
-            query = query.filter(Device.status == DeviceStatus(status.value))
+            stmt = stmt.where(Device.status == _DTO_TO_ENTITY_STATUS[status])
         if device_type:
-            query = query.filter(Device.type == DeviceType(device_type.value))
+            stmt = stmt.where(Device.type == _DTO_TO_ENTITY_TYPE[device_type])
         
-        # Get total count
-        total = query.count()
+        # The exact count scans every matching row, so it is opt-in
+        total = None
+        if include_total:
+            total = session.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
         
-        # Apply pagination
-        offset = (page - 1) * page_size
-        devices = query.offset(offset).limit(page_size).all()
+        stmt = stmt.order_by(Device.id)
         
-        return devices, total
+        # Apply pagination
+        if cursor_id is not None:
+            stmt = stmt.where(Device.id > cursor_id)
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        
+        # Fetch one extra row to know whether another page follows
+        result = session.execute(stmt.limit(page_size + 1))
+        devices = result.all() if fields else result.scalars().all()
+        devices, has_more = devices[:page_size], len(devices) > page_size
+        next_cursor = devices[-1].id if has_more else None
+        
+        return devices, total, next_cursor
     
     @staticmethod
     def get_device_by_id(session: Session, device_id: int) -> Optional[Device]:
         """
         Get a device by its ID.
         
+        Uses session.get, so a device already loaded in this session is
+        returned from the identity map without a query.
+        
         Args:
             session: Database session
             device_id: Device ID to look up
@@ -92,7 +200,43 @@ class DeviceDAO:
         Returns:
             Device if found, None otherwise
         """
-        return session.query(Device).filter(Device.id == device_id).one_or_none()
+        return session.get(Device, device_id, options=[raiseload('*')])
+    
+    @staticmethod
+    def get_devices_by_ids(session: Session, ids: List[int]) -> dict[int, Device]:
+        """
+        Get several devices by ID with one query per 1000 ids.
+        
+        Prefer this over calling get_device_by_id in a loop.
+        
+        Args:
+            session: Database session
+            ids: Device IDs to look up
+            
+        Returns:
+            Dict mapping ID to device; IDs that do not exist are absent
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        devices = {}
+        for start in range(0, len(unique_ids), IDS_CHUNK_SIZE):
+            chunk = unique_ids[start:start + IDS_CHUNK_SIZE]
+            stmt = _SELECT_DEVICES.where(Device.id.in_(chunk))
+            devices.update((d.id, d) for d in session.execute(stmt).scalars())
+        return devices
+    
+    @staticmethod
+    async def get_device_by_id_async(session: AsyncSession, device_id: int) -> Optional[Device]:
+        """
+        Get a device by its ID from an async endpoint.
+        
+        Args:
+            session: Async database session
+            device_id: Device ID to look up
+            
+        Returns:
+            Device if found, None otherwise
+        """
+        return await session.get(Device, device_id, options=[raiseload('*')])
     
     @staticmethod
     def get_device_by_serial(session: Session, serial_number: str) -> Optional[Device]:
@@ -106,48 +250,94 @@ class DeviceDAO:
         Returns:
             Device if found, None otherwise
         """
-        return session.query(Device).filter(
-            Device.serial_number == serial_number
-        ).one_or_none()
+        return session.execute(_SELECT_BY_SERIAL, {'serial_number': serial_number}).scalar_one_or_none()
     
     @staticmethod
-    def update_device(session: Session, device_id: int, **kwargs) -> Optional[Device]:
+    def update_device(session: Session, device_id: int, commit: bool = True, **kwargs) -> Optional[Device]:
         """
         Update device attributes.
         
         Args:
             session: Database session
             device_id: Device ID to update
+            commit: Commit immediately; if False the caller commits
             **kwargs: Field names and new values
             
         Returns:
             Updated device if found, None otherwise
         """
-        device = session.query(Device).filter(Device.id == device_id).one_or_none()
-        if not device:
-            return None
-        
         # Update allowed fields
         allowed_fields = ['name', 'description', 'location', 'specifications']
-        for field, value in kwargs.items():
-            if field in allowed_fields and hasattr(device, field):
-                setattr(device, field, value)
+        values = {field: value for field, value in kwargs.items() if field in allowed_fields}
+        if not values:
+            return DeviceDAO.get_device_by_id(session, device_id)
         
+        stmt = update(Device).where(Device.id == device_id).values(**values).returning(Device)
         try:
-            session.commit()
-            session.refresh(device)
-            return device
-        except Exception as e:
-            session.rollback()
+            with _write_scope(session, commit):
+                device = session.execute(stmt).scalar_one_or_none()
+        except (IntegrityError, OperationalError) as e:
+            logger.error(f"Device {device_id} update error: {e}")
             return None
+        return device
+    
+    @staticmethod
+    def _transition(
+        session: Session,
+        device_id: int,
+        action: str,
+        values: dict,
+        commit: bool
+    ) -> Optional[tuple[Device, Optional[str]]]:
+        """
+        Apply a status transition in a single UPDATE ... RETURNING statement.
+        
+        The allowed source statuses are enforced in the WHERE clause, and the
+        previous status is captured by a locking CTE in the same round trip.
+        
+        Args:
+            session: Database session
+            device_id: Device ID to update
+            action: Transition name, a key of ALLOWED_FROM
+            values: Column values to set
+            commit: Commit immediately; if False the caller commits
+            
+        Returns:
+            Tuple of (updated device, previous status value), or None if the
+            device does not exist or is not in an allowed status
+        """
+        old = (
+            select(Device.id, Device.status.label('old_status'))
+            .where(Device.id == device_id)
+            .with_for_update()
+            .cte('old')
+        )
+        stmt = (
+            update(Device)
+            .where(Device.id == old.c.id, Device.status.in_(ALLOWED_FROM[action]))
+            .values(**values)
+            .returning(Device, old.c.old_status)
+        )
+        
+        try:
+            with _write_scope(session, commit):
+                row = session.execute(stmt).one_or_none()
+        except (IntegrityError, OperationalError) as e:
+            logger.error(f"Device {device_id} {action} error: {e}")
+            return None
+        if row is None:
+            return None
+        device, old_status = row
+        return device, old_status.value if old_status else None
     
     @staticmethod
     def update_device_status(
         session: Session, 
         device_id: int, 
         new_status: DeviceStatusDto,
-        location: Optional[str] = None
-    ) -> Optional[Device]:
+        location: Optional[str] = None,
+        commit: bool = True
+    ) -> Optional[tuple[Device, Optional[str]]]:
         """
         Update device status with location change if provided.
         
@@ -156,51 +346,79 @@ class DeviceDAO:
             device_id: Device ID to update
             new_status: New status value
             location: Optional new location
+            commit: Commit immediately; if False the caller commits together
+                    with related writes (e.g. log_action)
             
         Returns:
-            Updated device if found, None otherwise
+            Tuple of (updated device, previous status) if found, None otherwise
         """
-        device = session.query(Device).filter(Device.id == device_id).one_or_none()
-        if not device:
-            return None
-        
-        old_status = device.status.value if device.status else None
-        device.status = DeviceStatus(new_status.value)
-        
+        values = {'status': _DTO_TO_ENTITY_STATUS[new_status]}
         if location:
-            device.location = location
+            values['location'] = location
         
-        try:
-            session.commit()
-            session.refresh(device)
-            return device
-        except Exception as e:
-            session.rollback()
+        return DeviceDAO._transition(session, device_id, 'status_change', values, commit)
+    
+    @staticmethod
+    def change_status_and_log(
+        session: Session,
+        device_id: int,
+        new_status: DeviceStatusDto,
+        action: str,
+        performed_by: Optional[int] = None,
+        notes: Optional[str] = None,
+        location: Optional[str] = None
+    ) -> Optional[tuple[Device, Optional[str]]]:
+        """
+        Update device status and log the action in a single transaction.
+        
+        Args:
+            session: Database session
+            device_id: Device ID to update
+            new_status: New status value
+            action: Action to log
+            performed_by: User ID who performed the action
+            notes: Optional notes
+            location: Optional new location
+            
+        Returns:
+            Tuple of (updated device, previous status), or None if the device
+            does not exist or the status change was rejected
+            
+        Raises:
+            IntegrityError, OperationalError: If the change could not be
+            committed; the transaction has been rolled back
+        """
+        result = DeviceDAO.update_device_status(session, device_id, new_status, location, commit=False)
+        if result is None:
             return None
+        
+        device, old_status = result
+        with _write_scope(session, commit=True):
+            session.add(DeviceLog(
+                device_id=device_id,
+                action=action,
+                old_status=old_status,
+                new_status=new_status.value,
+                performed_by=performed_by,
+                notes=notes
+            ))
+        return device, old_status
     
     @staticmethod
-    def delete_device(session: Session, device_id: int) -> bool:
+    def delete_device(session: Session, device_id: int, commit: bool = True) -> bool:
         """
         Delete a device (soft delete by setting status to retired).
         
         Args:
             session: Database session
             device_id: Device ID to delete
+            commit: Commit immediately; if False the caller commits
             
         Returns:
             True if deleted successfully, False otherwise
         """
-        device = session.query(Device).filter(Device.id == device_id).one_or_none()
-        if not device:
-            return False
-        
-        device.status = DeviceStatus.RETIRED
-        try:
-            session.commit()
-            return True
-        except Exception as e:
-            session.rollback()
-            return False
+        values = {'status': DeviceStatus.RETIRED}
+        return DeviceDAO._transition(session, device_id, 'retire', values, commit) is not None
     
     @staticmethod
     def get_devices_by_status(session: Session, status: DeviceStatusDto) -> List[Device]:
@@ -214,16 +432,16 @@ class DeviceDAO:
         Returns:
             List of devices with the specified status
         """
-        return session.query(Device).filter(
-            Device.status == DeviceStatus(status.value)
-        ).all()
+        params = {'status': _DTO_TO_ENTITY_STATUS[status]}
+        return list(session.execute(_SELECT_BY_STATUS, params).scalars())
     
     @staticmethod
     def deploy_device(
         session: Session, 
         device_id: int, 
-        deployment_location: str
-    ) -> Optional[Device]:
+        deployment_location: str,
+        commit: bool = True
+    ) -> Optional[tuple[Device, Optional[str]]]:
         """
         Deploy a device to the field.
         
@@ -231,38 +449,26 @@ class DeviceDAO:
             session: Database session
             device_id: Device ID to deploy
             deployment_location: Deployment location
+            commit: Commit immediately; if False the caller commits together
+                    with related writes (e.g. log_action)
             
         Returns:
-            Updated device if successful, None otherwise
+            Tuple of (updated device, previous status) if successful, None otherwise
         """
-        device = session.query(Device).filter(Device.id == device_id).one_or_none()
-        if not device:
-            return None
-        
-        # Allow deployment from in_stock, reserved, or maintenance status
-        allowed_statuses = [DeviceStatus.IN_STOCK, DeviceStatus.RESERVED, DeviceStatus.MAINTENANCE]
-        if device.status not in allowed_statuses:
-            return None
-        
-        from datetime import datetime
-        device.status = DeviceStatus.DEPLOYED
-        device.location = deployment_location
-        device.deploy_date = datetime.utcnow()
-        
-        try:
-            session.commit()
-            session.refresh(device)
-            return device
-        except Exception as e:
-            session.rollback()
-            return None
+        values = {
+            'status': DeviceStatus.DEPLOYED,
+            'location': deployment_location,
+            'deploy_date': datetime.utcnow()
+        }
+        return DeviceDAO._transition(session, device_id, 'deploy', values, commit)
     
     @staticmethod
     def recall_device(
         session: Session, 
         device_id: int, 
-        warehouse_location: Optional[str] = None
-    ) -> Optional[Device]:
+        warehouse_location: Optional[str] = None,
+        commit: bool = True
+    ) -> Optional[tuple[Device, Optional[str]]]:
         """
         Recall a device from the field to stock.
         
@@ -270,86 +476,62 @@ class DeviceDAO:
             session: Database session
             device_id: Device ID to recall
             warehouse_location: Optional new warehouse location
+            commit: Commit immediately; if False the caller commits together
+                    with related writes (e.g. log_action)
             
         Returns:
-            Updated device if successful, None otherwise
+            Tuple of (updated device, previous status) if successful, None otherwise
         """
-        device = session.query(Device).filter(Device.id == device_id).one_or_none()
-        if not device:
-            return None
-        
-        if device.status != DeviceStatus.DEPLOYED:
-            return None
-        
-        device.status = DeviceStatus.IN_STOCK
+        values = {'status': DeviceStatus.IN_STOCK, 'deploy_date': None}
         if warehouse_location:
-            device.location = warehouse_location
-        device.deploy_date = None
+            values['location'] = warehouse_location
         
-        try:
-            session.commit()
-            session.refresh(device)
-            return device
-        except Exception as e:
-            session.rollback()
-            return None
+        return DeviceDAO._transition(session, device_id, 'recall', values, commit)
     
     @staticmethod
-    def send_to_maintenance(session: Session, device_id: int) -> Optional[Device]:
+    def send_to_maintenance(
+        session: Session,
+        device_id: int,
+        commit: bool = True
+    ) -> Optional[tuple[Device, Optional[str]]]:
         """
         Send a device to maintenance.
         
         Args:
             session: Database session
             device_id: Device ID to send to maintenance
+            commit: Commit immediately; if False the caller commits together
+                    with related writes (e.g. log_action)
             
         Returns:
-            Updated device if successful, None otherwise
+            Tuple of (updated device, previous status) if successful, None otherwise
         """
-        device = session.query(Device).filter(Device.id == device_id).one_or_none()
-        if not device:
-            return None
-        
-        from datetime import datetime
-        device.status = DeviceStatus.MAINTENANCE
-        device.last_maintenance_date = datetime.utcnow()
-        
-        try:
-            session.commit()
-            session.refresh(device)
-            return device
-        except Exception as e:
-            session.rollback()
-            return None
+        values = {
+            'status': DeviceStatus.MAINTENANCE,
+            'last_maintenance_date': datetime.utcnow()
+        }
+        return DeviceDAO._transition(session, device_id, 'maintenance', values, commit)
 
     @staticmethod
-    def reserve_device(session: Session, device_id: int) -> Optional[Device]:
+    def reserve_device(
+        session: Session,
+        device_id: int,
+        commit: bool = True
+    ) -> Optional[tuple[Device, Optional[str]]]:
         """
         Reserve a device for an order.
         
         Args:
             session: Database session
             device_id: Device ID to reserve
+            commit: Commit immediately; if False the caller commits together
+                    with related writes (e.g. log_action)
             
         Returns:
-            Updated device if successful, None otherwise
+            Tuple of (updated device, previous status) if successful, None otherwise
         """
-        device = session.query(Device).filter(Device.id == device_id).one_or_none()
-        if not device:
-            return None
-        
-        if device.status != DeviceStatus.IN_STOCK:
-            return None
-        
-        device.status = DeviceStatus.RESERVED
-        
-        try:
-            session.commit()
-            session.refresh(device)
-            return device
-        except Exception as e:
-            session.rollback()
-            return None
+        values = {'status': DeviceStatus.RESERVED}
+        return DeviceDAO._transition(session, device_id, 'reserve', values, commit)
     
     @staticmethod
     def log_action(
@@ -359,7 +541,8 @@ class DeviceDAO:
         old_status: Optional[str] = None,
         new_status: Optional[str] = None,
         performed_by: Optional[int] = None,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        commit: bool = True
     ) -> bool:
         """
         Log a device lifecycle action.
@@ -372,22 +555,42 @@ class DeviceDAO:
             new_status: New status
             performed_by: User ID who performed the action
             notes: Optional notes
+            commit: Commit immediately; if False the caller commits
             
         Returns:
             True if logged successfully
         """
-        log = DeviceLog(
-            device_id=device_id,
-            action=action,
-            old_status=old_status,
-            new_status=new_status,
-            performed_by=performed_by,
-            notes=notes
-        )
-        session.add(log)
+        record = {
+            'device_id': device_id,
+            'action': action,
+            'old_status': old_status,
+            'new_status': new_status,
+            'performed_by': performed_by,
+            'notes': notes
+        }
+        return DeviceDAO.log_actions(session, [record], commit) == 1
+    
+    @staticmethod
+    def log_actions(session: Session, records: List[dict], commit: bool = True) -> int:
+        """
+        Log several device lifecycle actions in one round trip and one commit.
+        
+        Args:
+            session: Database session
+            records: DeviceLog column values (device_id, action, old_status,
+                     new_status, performed_by, notes), one dict per action
+            commit: Commit immediately; if False the caller commits
+            
+        Returns:
+            Number of actions logged, 0 if the insert failed
+        """
+        if not records:
+            return 0
+        
         try:
-            session.commit()
-            return True
-        except Exception as e:
-            session.rollback()
-            return False
+            with _write_scope(session, commit):
+                session.execute(insert(DeviceLog), records)
+        except (IntegrityError, OperationalError) as e:
+            logger.error(f"Device action logging error: {e}")
+            return 0
+        return len(records)
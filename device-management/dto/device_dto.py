@@ -3,6 +3,7 @@ Data Transfer Objects (DTOs) for Device Management API.
 Defines request and response models using Pydantic.
 """
 
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
@@ -39,6 +40,23 @@ class DeviceTypeDto(str, Enum):
     GPU_NODE = "gpu_node"
 
 
+class DeviceField(str, Enum):
+    """Device fields that can be selected in list responses."""
+    ID = "id"
+    NAME = "name"
+    TYPE = "type"
+    SERIAL_NUMBER = "serial_number"
+    DESCRIPTION = "description"
+    STATUS = "status"
+    LOCATION = "location"
+    SPECIFICATIONS = "specifications"
+    PURCHASE_DATE = "purchase_date"
+    DEPLOY_DATE = "deploy_date"
+    LAST_MAINTENANCE_DATE = "last_maintenance_date"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
 class DeviceRequest(BaseModel):
     """Request model for creating a new device."""
     name: str = Field(..., min_length=1, max_length=100, description="Device name")
@@ -49,8 +67,15 @@ class DeviceRequest(BaseModel):
     specifications: Optional[str] = Field(None, description="Device specifications as JSON string")
 
 
-class DeviceResponse(BaseModel):
-    """Response model for device data."""
+@dataclass(slots=True)
+class DeviceResponse:
+    """
+    Response model for device data.
+    
+    A plain slotted dataclass rather than a BaseModel: it is only built from
+    entities that the database has already validated, so construction skips
+    pydantic validation. FastAPI still derives its schema for serialization.
+    """
     id: int
     name: str
     type: str
@@ -59,22 +84,21 @@ class DeviceResponse(BaseModel):
     status: str
     location: Optional[str]
     specifications: Optional[str]
-    purchase_date: Optional[str]
-    deploy_date: Optional[str]
-    last_maintenance_date: Optional[str]
-    created_at: str
-    updated_at: str
-    
-    class Config:
-        from_attributes = True
+    purchase_date: Optional[datetime]
+    deploy_date: Optional[datetime]
+    last_maintenance_date: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
 
 
 class DeviceListResponse(BaseModel):
     """Response model for list of devices."""
     devices: List[DeviceResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # Only set when include_total=true
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 
 class DeviceUpdateRequest(BaseModel):
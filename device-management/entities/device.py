@@ -3,13 +3,13 @@ Device entity models for the Device Management Microservice.
 Defines the database tables using SQLAlchemy ORM.
 """
 
-from enum import Enum as PyEnum
+from enum import StrEnum
 from helpers.config import Base
-from sqlalchemy import Column, String, Integer, DateTime, func, Text, Enum
+from sqlalchemy import Column, String, Integer, DateTime, func, Text, Enum, Index
 
 
-class DeviceStatus(PyEnum):
-    """Enumeration of possible device statuses."""
+class DeviceStatus(StrEnum):
+    """Enumeration of possible device statuses (members compare and serialize as their value)."""
     IN_STOCK = "in_stock"
     RESERVED = "reserved"
     DEPLOYED = "deployed"
@@ -17,7 +17,7 @@ class DeviceStatus(PyEnum):
     RETIRED = "retired"
 
 
-class DeviceType(PyEnum):
+class DeviceType(StrEnum):
     """Enumeration of device types.
     
     Supports both legacy and new explicit categories:
@@ -113,6 +113,13 @@ class Device(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), server_onupdate=func.now())
     
+    __table_args__ = (
+        # Filtered listings page by id, so (filter column, id) turns them
+        # into index range scans
+        Index('ix_t_devices_status_id', 'status', 'id'),
+        Index('ix_t_devices_type_id', 'type', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Device(id={self.id}, name='{self.name}', serial='{self.serial_number}', status='{self.status}')>"
     
@@ -5,8 +5,9 @@ Loads environment variables and sets up database connections.
 
 from typing import Final
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, raiseload, sessionmaker
 import logging
 
 # Environment variables with defaults
@@ -29,22 +30,67 @@ RABBITMQ_HOST: Final[str] = os.getenv('RABBITMQ_HOST', 'localhost')
 RABBITMQ_PORT: Final[int] = int(os.getenv('RABBITMQ_PORT', '5672'))
 RABBITMQ_USER: Final[str] = os.getenv('RABBITMQ_USER', 'guest')
 RABBITMQ_PASSWORD: Final[str] = os.getenv('RABBITMQ_PASSWORD', 'guest')
+# Connections kept by the sync publisher; bounds concurrent publishes from the threadpool
+RABBITMQ_POOL_SIZE: Final[int] = int(os.getenv('RABBITMQ_POOL_SIZE', '8'))
+
+# Telemetry publishing (buffered, fire-and-forget)
+TELEMETRY_BUFFER_SIZE: Final[int] = int(os.getenv('TELEMETRY_BUFFER_SIZE', '10000'))
+TELEMETRY_BATCH_SIZE: Final[int] = int(os.getenv('TELEMETRY_BATCH_SIZE', '256'))
+# Seconds to keep publishing buffered telemetry on shutdown before dropping it
+TELEMETRY_FLUSH_TIMEOUT: Final[float] = float(os.getenv('TELEMETRY_FLUSH_TIMEOUT', '10'))
+
+# Development/CI guard against N+1 queries: when enabled, every ORM SELECT
+# gets raiseload('*') so any lazy relationship load raises instead of querying
+SQL_RAISELOAD: Final[bool] = os.getenv('SQL_RAISELOAD', 'false').lower() == 'true'
+
+# Connection pool sizing, applied to each engine (sync and async)
+DB_POOL_SIZE: Final[int] = int(os.getenv('DB_POOL_SIZE', '25'))
+DB_MAX_OVERFLOW: Final[int] = int(os.getenv('DB_MAX_OVERFLOW', '25'))
+DB_POOL_TIMEOUT: Final[int] = int(os.getenv('DB_POOL_TIMEOUT', '30'))
 
 # PostgreSQL connection URL
 URL_DB: Final[str] = f'postgresql+psycopg2://{USER_DB}:{PASSWORD_DB}@{SERVER_DB}:5432/{NAME_DB}'
+URL_DB_ASYNC: Final[str] = f'postgresql+asyncpg://{USER_DB}:{PASSWORD_DB}@{SERVER_DB}:5432/{NAME_DB}'
 
 # SQLAlchemy setup
-# Increased pool size and recycle time to prevent timeouts and stale connections
+# Bounded pool with health checks; recycle prevents stale connections, and
+# values_plus_batch lets psycopg2 batch executemany() inserts and updates
 engine = create_engine(
     URL_DB, 
-    pool_size=50,
-    max_overflow=30,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
     pool_recycle=1800,
-    pool_pre_ping=True
+    pool_pre_ping=True,
+    executemany_mode='values_plus_batch'
 )
-LocalSession = sessionmaker(bind=engine)
+# Writes return their rows via RETURNING, so objects stay valid after commit
+# and expiring them would only force a reload SELECT on the next access
+LocalSession = sessionmaker(bind=engine, expire_on_commit=False)
 Base = declarative_base()
 
+# Async engine for the high-throughput ingestion endpoints (telemetry/events)
+async_engine = create_async_engine(
+    URL_DB_ASYNC,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=1800,
+    pool_pre_ping=True
+)
+AsyncLocalSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+def raiseload_everything(orm_execute_state):
+    """do_orm_execute hook adding raiseload('*') to every top-level ORM SELECT."""
+    if orm_execute_state.is_select and not orm_execute_state.is_relationship_load:
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload('*'))
+
+
+if SQL_RAISELOAD:
+    # Applies to sync and async sessions alike
+    event.listen(Session, 'do_orm_execute', raiseload_everything)
+
 
 def session_factory():
     """
@@ -58,6 +104,15 @@ def session_factory():
         session.close()
 
 
+async def async_session_factory():
+    """
+    Async counterpart of session_factory for async endpoints.
+    Yields an AsyncSession and closes it after use.
+    """
+    async with AsyncLocalSession() as session:
+        yield session
+
+
 # Logging setup
 def setup_logger():
     """Configure logging for the application."""
@@ -0,0 +1,39 @@
+"""
+Pagination helpers for Device Management Microservice.
+Encodes and decodes the opaque cursors used for keyset pagination.
+"""
+
+import base64
+import binascii
+
+
+def encode_cursor(device_id: int) -> str:
+    """
+    Encode the position of the last returned device into an opaque cursor.
+
+    Args:
+        device_id: ID of the last device on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    return base64.urlsafe_b64encode(str(device_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string received from the client
+
+    Returns:
+        ID of the last device of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
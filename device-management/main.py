@@ -5,15 +5,19 @@ A FastAPI-based microservice for managing IoT devices.
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from controllers.device_controller import router as device_router
-from helpers.config import Base, engine, logger
+from helpers.config import Base, engine, async_engine, logger
+from services.rabbitmq_publisher import rabbitmq_publisher
+from services.async_rabbitmq_publisher import async_rabbitmq_publisher
 
 # Create FastAPI application
 app = FastAPI(
     title="Device Management Microservice",
     description="Microservice for managing IoT devices - inventory, deployment, and lifecycle tracking",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -36,6 +40,17 @@ async def startup_event():
     # Create tables if they don't exist
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables initialized")
+    # Start publishing buffered telemetry
+    async_rabbitmq_publisher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release RabbitMQ and async database connections on shutdown."""
+    logger.info("Shutting down Device Management Microservice...")
+    await async_rabbitmq_publisher.close()
+    rabbitmq_publisher.close()
+    await async_engine.dispose()
 
 
 @app.get("/health")
@@ -0,0 +1,226 @@
+"""
+Async RabbitMQ Publisher Service for Device Management.
+Publishes device events to RabbitMQ from async endpoints without blocking the event loop.
+"""
+
+import asyncio
+import json
+import aio_pika
+from typing import Optional, Dict, Any
+from datetime import datetime
+from helpers.config import (
+    RABBITMQ_HOST,
+    RABBITMQ_PORT,
+    RABBITMQ_USER,
+    RABBITMQ_PASSWORD,
+    TELEMETRY_BUFFER_SIZE,
+    TELEMETRY_BATCH_SIZE,
+    TELEMETRY_FLUSH_TIMEOUT,
+    logger
+)
+
+
+class AsyncRabbitMQPublisher:
+    """aio-pika based publisher for device events, used by the async ingestion endpoints."""
+
+    def __init__(self):
+        """Initialize publisher state; the connection is opened on first use."""
+        self._connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+        self._channel: Optional[aio_pika.abc.AbstractChannel] = None
+        self._exchange: Optional[aio_pika.abc.AbstractExchange] = None
+        self._lock = asyncio.Lock()
+        # Telemetry is buffered here and published by a background task so
+        # the ingestion endpoint does not wait for the broker
+        self._telemetry_queue: asyncio.Queue = asyncio.Queue(maxsize=TELEMETRY_BUFFER_SIZE)
+        self._drain_task: Optional[asyncio.Task] = None
+        self._accepting_telemetry = True
+        self._in_flight = 0
+
+    async def _get_exchange(self) -> aio_pika.abc.AbstractExchange:
+        """Lazy initialization of the RabbitMQ connection, channel and exchange."""
+        if self._exchange is not None and self._channel is not None and not self._channel.is_closed:
+            return self._exchange
+
+        async with self._lock:
+            if self._connection is None or self._connection.is_closed:
+                self._connection = await aio_pika.connect_robust(
+                    host=RABBITMQ_HOST,
+                    port=RABBITMQ_PORT,
+                    login=RABBITMQ_USER,
+                    password=RABBITMQ_PASSWORD,
+                    heartbeat=600,
+                    timeout=5
+                )
+                logger.info(f"RabbitMQ (async) connected: {RABBITMQ_HOST}:{RABBITMQ_PORT}")
+
+            if self._channel is None or self._channel.is_closed:
+                self._channel = await self._connection.channel()
+                self._exchange = await self._channel.declare_exchange(
+                    'device_events',
+                    aio_pika.ExchangeType.TOPIC,
+                    durable=True
+                )
+        return self._exchange
+
+    async def _reset_channel(self):
+        """Close the current channel after an error so the next publish opens a fresh one."""
+        channel = self._channel
+        self._channel = None
+        self._exchange = None
+        if channel is not None and not channel.is_closed:
+            try:
+                await channel.close()
+            except Exception:
+                pass
+
+    def start(self):
+        """Start the background task that publishes buffered telemetry."""
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain_telemetry())
+
+    def enqueue_telemetry(self, device_id: int, device_name: str, data: Dict[str, Any]) -> bool:
+        """
+        Buffer device telemetry for publishing without waiting for the broker.
+
+        Args:
+            device_id: The device ID
+            device_name: The device name
+            data: Telemetry data
+    
+        Returns:
+            True if buffered, False if the buffer is full or the publisher is shutting down
+        """
+        if not self._accepting_telemetry:
+            return False
+        event_data = {
+            'event_type': 'telemetry',
+            'device_id': device_id,
+            'device_name': device_name,
+            'data': data,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        try:
+            self._telemetry_queue.put_nowait(event_data)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Telemetry buffer full, dropping telemetry from device {device_id}")
+            return False
+
+    async def _drain_telemetry(self):
+        """Publish buffered telemetry in batches whose confirms are awaited together."""
+        while True:
+            batch = [await self._telemetry_queue.get()]
+            while len(batch) < TELEMETRY_BATCH_SIZE and not self._telemetry_queue.empty():
+                batch.append(self._telemetry_queue.get_nowait())
+            self._in_flight = len(batch)
+
+            try:
+                exchange = await self._get_exchange()
+                await asyncio.gather(*(
+                    exchange.publish(
+                        aio_pika.Message(
+                            body=json.dumps(event_data).encode(),
+                            content_type='application/json',
+                            delivery_mode=aio_pika.DeliveryMode.NOT_PERSISTENT
+                        ),
+                        routing_key='device.telemetry'
+                    )
+                    for event_data in batch
+                ))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"RabbitMQ telemetry batch publish error, dropped {len(batch)} messages: {e}")
+                await self._reset_channel()
+            finally:
+                self._in_flight = 0
+                for _ in batch:
+                    self._telemetry_queue.task_done()
+
+    async def publish_event(self, routing_key: str, event_data: Dict[str, Any]) -> bool:
+        """
+        Publish an event to RabbitMQ.
+
+        Args:
+            routing_key: The routing key for the message (e.g., 'device.telemetry', 'device.event')
+            event_data: The event data to publish
+
+        Returns:
+            True if published successfully, False otherwise
+        """
+        try:
+            # Add timestamp if not present
+            if 'timestamp' not in event_data:
+                event_data['timestamp'] = datetime.utcnow().isoformat()
+
+            exchange = await self._get_exchange()
+            await exchange.publish(
+                aio_pika.Message(
+                    body=json.dumps(event_data).encode(),
+                    content_type='application/json',
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+                ),
+                routing_key=routing_key
+            )
+
+            logger.info(f"Published event: {routing_key}")
+            return True
+
+        except (aio_pika.exceptions.AMQPError, ConnectionError, asyncio.TimeoutError) as e:
+            logger.error(f"RabbitMQ publish error: {e}")
+            await self._reset_channel()
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected RabbitMQ error: {e}")
+            return False
+
+    async def publish_device_event(self, device_id: int, device_name: str, event_type: str, details: Dict[str, Any]) -> bool:
+        """
+        Publish device event (alerts, errors, etc.).
+
+        Args:
+            device_id: The device ID
+            device_name: The device name
+            event_type: Type of event
+            details: Event details
+
+        Returns:
+            True if published successfully
+        """
+        event_data = {
+            'event_type': event_type,
+            'device_id': device_id,
+            'device_name': device_name,
+            'details': details
+        }
+        return await self.publish_event('device.event', event_data)
+
+    async def close(self):
+        """Flush buffered telemetry, stop the telemetry publisher and close RabbitMQ connection."""
+        # Telemetry already answered with 200 is published before shutting down,
+        # within TELEMETRY_FLUSH_TIMEOUT
+        self._accepting_telemetry = False
+        if self._drain_task is not None and not self._drain_task.done():
+            try:
+                await asyncio.wait_for(self._telemetry_queue.join(), TELEMETRY_FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                unsent = self._telemetry_queue.qsize() + self._in_flight
+                logger.error(f"Telemetry flush timed out after {TELEMETRY_FLUSH_TIMEOUT}s, {unsent} messages unsent")
+
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+        try:
+            if self._connection and not self._connection.is_closed:
+                await self._connection.close()
+                logger.info("RabbitMQ (async) connection closed")
+        except Exception as e:
+            logger.error(f"Error closing RabbitMQ connection: {e}")
+
+
+# Singleton instance
+async_rabbitmq_publisher = AsyncRabbitMQPublisher()
@@ -5,59 +5,93 @@ Publishes device events to RabbitMQ for the Monitoring service.
 
 import json
 import pika
-import threading
-from typing import Optional, Dict, Any
+import queue
+from contextlib import contextmanager
+from typing import Iterator, Optional, Dict, Any
 from datetime import datetime
-from helpers.config import RABBITMQ_HOST, RABBITMQ_PORT, RABBITMQ_USER, RABBITMQ_PASSWORD, logger
+from pika.adapters.blocking_connection import BlockingChannel
+from helpers.config import (
+    RABBITMQ_HOST,
+    RABBITMQ_PORT,
+    RABBITMQ_USER,
+    RABBITMQ_PASSWORD,
+    RABBITMQ_POOL_SIZE,
+    logger
+)
 
 
 class RabbitMQPublisher:
     """RabbitMQ publisher for device events."""
 
-    def __init__(self):
-        """Initialize RabbitMQ connection."""
-        self._connection: Optional[pika.BlockingConnection] = None
-        self._channel: Optional[pika.channel.Channel] = None
-        self._lock = threading.Lock()
+    def __init__(self, pool_size: int = RABBITMQ_POOL_SIZE):
+        """Initialize the channel pool; connections are opened on first use."""
+        # pika's BlockingConnection is not thread-safe, so every pooled channel
+        # owns its connection and is used by one thread at a time
+        self._pool_size = pool_size
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(None)
 
-    @property
-    def connection(self) -> pika.BlockingConnection:
-        """Lazy initialization of RabbitMQ connection."""
-        # Ensure connection creation is also locked or handle it within publish
-        if self._connection is None or self._connection.is_closed:
-            try:
-                credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
-                parameters = pika.ConnectionParameters(
-                    host=RABBITMQ_HOST,
-                    port=RABBITMQ_PORT,
-                    credentials=credentials,
-                    heartbeat=600,
-                    blocked_connection_timeout=300,
-                    socket_timeout=5
-                )
-                self._connection = pika.BlockingConnection(parameters)
-                self._channel = self._connection.channel()
-                
-                # Declare exchange
-                self._channel.exchange_declare(
-                    exchange='device_events',
-                    exchange_type='topic',
-                    durable=True
-                )
-                
-                logger.info(f"RabbitMQ connected: {RABBITMQ_HOST}:{RABBITMQ_PORT}")
-            except pika.exceptions.AMQPConnectionError as e:
-                logger.error(f"RabbitMQ connection failed: {e}")
-                raise
-        return self._connection
+    def _open_channel(self) -> BlockingChannel:
+        """Open a connection and channel and declare the exchange."""
+        credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+        parameters = pika.ConnectionParameters(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            credentials=credentials,
+            heartbeat=600,
+            blocked_connection_timeout=300,
+            socket_timeout=5
+        )
+        connection = pika.BlockingConnection(parameters)
+        channel = connection.channel()
+        
+        # Declare exchange
+        channel.exchange_declare(
+            exchange='device_events',
+            exchange_type='topic',
+            durable=True
+        )
+        
+        logger.info(f"RabbitMQ connected: {RABBITMQ_HOST}:{RABBITMQ_PORT}")
+        return channel
 
-    @property
-    def channel(self) -> pika.channel.Channel:
-        """Get RabbitMQ channel."""
-        if self._channel is None or self._channel.is_closed:
-            self.connection  # This will create the connection
-            self._channel = self._connection.channel()
-        return self._channel
+    @staticmethod
+    def _discard(channel: Optional[BlockingChannel]):
+        """Close the connection behind a broken or unused channel."""
+        if channel is None:
+            return
+        try:
+            if not channel.connection.is_closed:
+                channel.connection.close()
+        except Exception as e:
+            logger.error(f"Error closing RabbitMQ connection: {e}")
+
+    @contextmanager
+    def get_channel(self, timeout: float = 5) -> Iterator[BlockingChannel]:
+        """
+        Borrow a channel from the pool, reconnecting it if it was closed.
+        
+        Args:
+            timeout: Seconds to wait for a free channel
+            
+        Raises:
+            queue.Empty: If no channel became free in time
+            pika.exceptions.AMQPConnectionError: If the broker is unreachable
+        """
+        channel = self._pool.get(timeout=timeout)
+        try:
+            if channel is None or channel.is_closed or channel.connection.is_closed:
+                self._discard(channel)
+                channel = None
+                channel = self._open_channel()
+            yield channel
+        except (pika.exceptions.AMQPConnectionError, pika.exceptions.AMQPChannelError):
+            self._discard(channel)
+            channel = None
+            raise
+        finally:
+            self._pool.put(channel)
 
     def publish_event(self, routing_key: str, event_data: Dict[str, Any]) -> bool:
         """
@@ -70,15 +104,15 @@ class RabbitMQPublisher:
         Returns:
             True if published successfully, False otherwise
         """
-        with self._lock:
-            try:
-                # Add timestamp if not present
-                if 'timestamp' not in event_data:
-                    event_data['timestamp'] = datetime.utcnow().isoformat()
-                
-                message = json.dumps(event_data)
-                
-                self.channel.basic_publish(
+        try:
+            # Add timestamp if not present
+            if 'timestamp' not in event_data:
+                event_data['timestamp'] = datetime.utcnow().isoformat()
+            
+            message = json.dumps(event_data)
+            
+            with self.get_channel() as channel:
+                channel.basic_publish(
                     exchange='device_events',
                     routing_key=routing_key,
                     body=message,
@@ -87,18 +121,19 @@ class RabbitMQPublisher:
                         content_type='application/json'
                     )
                 )
-                
-                logger.info(f"Published event: {routing_key}")
-                return True
-                
-            except (pika.exceptions.AMQPConnectionError, pika.exceptions.AMQPChannelError) as e:
-                logger.error(f"RabbitMQ publish error: {e}")
-                self._connection = None  # Reset connection
-                self._channel = None
-                return False
-            except Exception as e:
-                logger.error(f"Unexpected RabbitMQ error: {e}")
-                return False
+            
+            logger.info(f"Published event: {routing_key}")
+            return True
+            
+        except (pika.exceptions.AMQPConnectionError, pika.exceptions.AMQPChannelError) as e:
+            logger.error(f"RabbitMQ publish error: {e}")
+            return False
+        except queue.Empty:
+            logger.error(f"RabbitMQ publish error: no free channel for {routing_key}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected RabbitMQ error: {e}")
+            return False
 
     def publish_telemetry(self, device_id: int, device_name: str, data: Dict[str, Any]) -> bool:
         """
@@ -163,13 +198,18 @@ class RabbitMQPublisher:
         return self.publish_device_event(device_id, device_name, 'status_change', details)
 
     def close(self):
-        """Close RabbitMQ connection."""
-        try:
-            if self._connection and not self._connection.is_closed:
-                self._connection.close()
-                logger.info("RabbitMQ connection closed")
-        except Exception as e:
-            logger.error(f"Error closing RabbitMQ connection: {e}")
+        """Close the pooled RabbitMQ connections that are not in use."""
+        closed = 0
+        for _ in range(self._pool_size):
+            try:
+                channel = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if channel is not None:
+                self._discard(channel)
+                closed += 1
+            self._pool.put(None)
+        logger.info(f"RabbitMQ connections closed: {closed}")
 
 
 # Singleton instance
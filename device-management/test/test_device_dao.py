@@ -0,0 +1,101 @@
+"""
+Query-count tests for the Device DAO.
+Runs against an in-memory SQLite database with raiseload('*') applied to every
+ORM SELECT, so an accidental lazy load fails instead of adding queries.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from helpers.config import Base, raiseload_everything
+from dal.device_dao import DeviceDAO
+from dto.device_dto import DeviceStatusDto
+from entities.device import Device, DeviceStatus
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with the device schema."""
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Session seeded with 5 devices, with raiseload('*') on every ORM SELECT."""
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add_all([
+        Device(name=f'device-{i}', serial_number=f'SN{i}', status=DeviceStatus.DEPLOYED if i % 2 else DeviceStatus.IN_STOCK)
+        for i in range(5)
+    ])
+    session.commit()
+    event.listen(session, 'do_orm_execute', raiseload_everything)
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements executed on the engine from this point on."""
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, 'after_cursor_execute', count)
+    yield executed
+    event.remove(engine, 'after_cursor_execute', count)
+
+
+def test_get_all_devices_issues_one_statement(session, statements):
+    devices, total, next_cursor = DeviceDAO.get_all_devices(session, page_size=2)
+
+    # Rendering every column must not load anything else
+    rendered = [(d.id, d.name, d.status, d.created_at) for d in devices]
+
+    assert [r[0] for r in rendered] == [1, 2]
+    assert total is None
+    assert next_cursor == 2
+    assert len(statements) == 1
+
+
+def test_get_all_devices_with_cursor_and_filter_issues_one_statement(session, statements):
+    devices, _, next_cursor = DeviceDAO.get_all_devices(
+        session, status=DeviceStatusDto.IN_STOCK, cursor_id=1, page_size=2
+    )
+
+    assert [d.id for d in devices] == [3, 5]
+    assert next_cursor is None
+    assert len(statements) == 1
+
+
+def test_get_all_devices_include_total_adds_one_statement(session, statements):
+    devices, total, _ = DeviceDAO.get_all_devices(session, page_size=2, include_total=True)
+
+    assert len(devices) == 2
+    assert total == 5
+    assert len(statements) == 2
+
+
+def test_get_all_devices_projection_issues_one_statement(session, statements):
+    rows, _, _ = DeviceDAO.get_all_devices(session, page_size=5, fields=['name'])
+
+    assert [(r.id, r.name) for r in rows] == [(i + 1, f'device-{i}') for i in range(5)]
+    assert len(statements) == 1
+
+
+def test_get_devices_by_status_issues_one_statement(session, statements):
+    devices = DeviceDAO.get_devices_by_status(session, DeviceStatusDto.DEPLOYED)
+
+    assert [d.id for d in devices] == [2, 4]
+    assert len(statements) == 1
+
+
+def test_get_devices_by_ids_issues_one_statement(session, statements):
+    devices = DeviceDAO.get_devices_by_ids(session, [1, 3, 3, 99])
+
+    assert sorted(devices) == [1, 3]
+    assert len(statements) == 1